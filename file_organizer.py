@@ -1,89 +1,290 @@
 import sys
 import os
-import shutil
+import collections
+import ctypes
+import errno
+import stat
+import threading
+from operator import itemgetter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QFileDialog, QLabel, 
                              QListWidget, QMessageBox, QProgressBar, QCheckBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
 
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+def _load_renameat2():
+    """Return libc's renameat2 on Linux, or None if it isn't available"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    renameat2.restype = ctypes.c_int
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
+
+# Serializes the check-then-rename fallback in _move_file, which is only
+# race-free if no other move thread runs between the check and the rename
+_rename_fallback_lock = threading.Lock()
+
+# Whether moves can be done relative to an open directory descriptor, so the
+# kernel doesn't resolve the source directory path on every syscall
+_HAVE_DIR_FD = (hasattr(os, 'O_DIRECTORY')
+                and {os.open, os.mkdir, os.stat, os.rename, os.link, os.unlink} <= os.supports_dir_fd)
+
+
 class FileOrganizerThread(QThread):
     """Thread for organizing files without freezing the GUI"""
     progress_update = pyqtSignal(int)
     finished_signal = pyqtSignal(dict)
     error_signal = pyqtSignal(str)
     preview_signal = pyqtSignal(dict)
+    # Files moved so far and the per-extension counts since the last chunk
+    chunk_signal = pyqtSignal(int, dict)
+
+    # Number of renames kept in flight at once, which helps most on
+    # high-latency (e.g. network) filesystems
+    MOVE_WORKERS = 16
+
+    # Number of moved files reported per chunk_signal emission
+    CHUNK_SIZE = 256
 
     def __init__(self, source_dir, preview_only=False):
         super().__init__()
         self.source_dir = source_dir
         self.preview_only = preview_only
 
+    def _iter_files(self):
+        """Yield the non-hidden regular files in the source directory"""
+        # DirEntry caches the file type, so no extra stat is needed per entry
+        with os.scandir(self.source_dir) as it:
+            for entry in it:
+                # Check the name first; it's cheaper than the file type check
+                if not entry.name.startswith('.') and entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    @staticmethod
+    def _get_extension(file):
+        """Return the lowercase extension of a file name, used as its folder name"""
+        # Same result as os.path.splitext for the non-hidden names passed here
+        head, _, ext = file.rpartition('.')
+        return ext.lower() if head and ext else 'no_extension'
+
+    @staticmethod
+    def _move_file(source_path, dest_path, dir_fd=None):
+        """Move a file without overwriting, raising FileExistsError if dest_path exists
+        
+        Paths are relative to dir_fd when it is given.
+        """
+        # Source and destination are both inside source_dir, so no copy
+        # fallback is needed (moves across filesystems are not supported)
+        if os.name == 'nt':
+            # Windows already refuses to rename onto an existing file
+            os.rename(source_path, dest_path)
+            return
+        
+        # On Linux, renameat2 with RENAME_NOREPLACE fails atomically if the
+        # target exists, so a move is a single syscall
+        global _renameat2
+        if _renameat2 is not None:
+            fd = _AT_FDCWD if dir_fd is None else dir_fd
+            if _renameat2(fd, os.fsencode(source_path), fd,
+                          os.fsencode(dest_path), _RENAME_NOREPLACE) == 0:
+                return
+            err = ctypes.get_errno()
+            # EINVAL/ENOSYS mean the kernel or filesystem doesn't support the
+            # flag, so stop trying it and fall back below
+            if err not in (errno.EINVAL, errno.ENOSYS):
+                raise OSError(err, os.strerror(err), source_path, None, dest_path)
+            _renameat2 = None
+        
+        # os.rename silently replaces the target on POSIX, but os.link fails
+        # if it exists
+        try:
+            os.link(source_path, dest_path, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Filesystem without hard link support
+            with _rename_fallback_lock:
+                try:
+                    os.stat(dest_path, dir_fd=dir_fd, follow_symlinks=False)
+                except FileNotFoundError:
+                    os.rename(source_path, dest_path, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                    return
+            raise FileExistsError(dest_path)
+        
+        try:
+            os.unlink(source_path, dir_fd=dir_fd)
+        except OSError:
+            # Don't leave the file in both places
+            os.unlink(dest_path, dir_fd=dir_fd)
+            raise
+
+    def _move_to_dir(self, source_path, ext_dir, file, dir_fd=None):
+        """Move a file into ext_dir, adding a numeric suffix on name conflicts"""
+        dest_path = f"{ext_dir}{os.sep}{file}"
+        
+        # Handle file name conflicts only when the move actually fails, so
+        # the common case needs no extra stat
+        try:
+            self._move_file(source_path, dest_path, dir_fd)
+        except FileExistsError:
+            base, extension = os.path.splitext(file)
+            counter = 1
+            while True:
+                dest_path = os.path.join(ext_dir, f"{base}_{counter}{extension}")
+                try:
+                    self._move_file(source_path, dest_path, dir_fd)
+                    break
+                except FileExistsError:
+                    counter += 1
+
+    def _make_ext_dir(self, ext, dir_fd=None):
+        """Create the directory for an extension and return its path for moves"""
+        if dir_fd is None:
+            ext_dir = os.path.join(self.source_dir, ext)
+            os.makedirs(ext_dir, exist_ok=True)
+            return ext_dir
+        
+        try:
+            os.mkdir(ext, dir_fd=dir_fd)
+        except FileExistsError:
+            if not stat.S_ISDIR(os.stat(ext, dir_fd=dir_fd).st_mode):
+                raise
+        return ext
+
+    def _run_preview(self):
+        """Count files per extension without touching the filesystem further"""
+        organized_files = collections.Counter()
+        get_extension = self._get_extension
+        for entry in self._iter_files():
+            organized_files[get_extension(entry.name)] += 1
+        
+        if not organized_files:
+            self.error_signal.emit("No files found in the selected directory.")
+            return
+        
+        self.progress_update.emit(100)
+        self.preview_signal.emit(organized_files)
+
+    def _move_files(self, buckets, total_files, dir_fd=None):
+        """Move every file into its extension directory, reporting progress"""
+        # Local names for attributes used in the per-file loop
+        emit_progress = self.progress_update.emit
+        source_dir = self.source_dir
+        
+        # Last progress value sent to the GUI
+        last_progress = -1
+        
+        # Counts of moved files not yet sent in a chunk_signal
+        batch_counts = collections.Counter()
+        emit_chunk = self.chunk_signal.emit
+        moved_files = 0
+        
+        # Maps each pending move to its file's extension. Only a bounded
+        # number of moves is queued at once
+        pending = {}
+        max_pending = self.MOVE_WORKERS * 4
+        
+        def collect(done):
+            nonlocal moved_files, last_progress, batch_counts
+            for future in done:
+                future.result()
+                batch_counts[pending.pop(future)] += 1
+                moved_files += 1
+                
+                if moved_files % self.CHUNK_SIZE == 0:
+                    emit_chunk(moved_files, batch_counts)
+                    batch_counts = collections.Counter()
+                
+                # Only update progress when the percentage actually changes
+                progress = min(moved_files * 100 // total_files, 100)
+                if progress != last_progress:
+                    emit_progress(progress)
+                    last_progress = progress
+        
+        # Create every extension directory before any file is moved, so a
+        # failure here leaves the source directory untouched
+        make_ext_dir = self._make_ext_dir
+        ext_dirs = {ext: make_ext_dir(ext, dir_fd) for ext in buckets}
+        
+        # Move one extension at a time so each destination directory stays
+        # hot in the kernel's caches
+        with ThreadPoolExecutor(max_workers=self.MOVE_WORKERS) as executor:
+            submit = executor.submit
+            move_to_dir = self._move_to_dir
+            try:
+                for ext, names in buckets.items():
+                    ext_dir = ext_dirs[ext]
+                    for name in names:
+                        source_path = name if dir_fd is not None else os.path.join(source_dir, name)
+                        pending[submit(move_to_dir, source_path, ext_dir, name, dir_fd)] = ext
+                        if len(pending) >= max_pending:
+                            collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                
+                collect(wait(pending).done)
+            except Exception:
+                # Stop moving the remaining files after the first failure
+                for future in pending:
+                    future.cancel()
+                raise
+        
+        if batch_counts:
+            emit_chunk(moved_files, batch_counts)
+        
+        if last_progress != 100:
+            emit_progress(100)
+
     def run(self):
+        if self.preview_only:
+            try:
+                self._run_preview()
+            except Exception as e:
+                self.error_signal.emit(f"Error previewing files: {str(e)}")
+            return
+        
         try:
+            # Group file names by extension
+            buckets = {}
+            get_extension = self._get_extension
+            for entry in self._iter_files():
+                name = entry.name
+                buckets.setdefault(get_extension(name), []).append(name)
+            
             # Dictionary to store extension counts
-            organized_files = {}
+            organized_files = collections.Counter(
+                {ext: len(names) for ext, names in buckets.items()})
             
-            # Get all files in the directory
-            files = [f for f in os.listdir(self.source_dir) 
-                    if os.path.isfile(os.path.join(self.source_dir, f))]
+            total_files = sum(organized_files.values())
             
-            if not files:
+            if not total_files:
                 self.error_signal.emit("No files found in the selected directory.")
                 return
             
-            # Calculate total files for progress bar
-            total_files = len(files)
+            # Open the source directory once so moves can use paths relative
+            # to it; falls back to full paths where *at() calls aren't available
+            dir_fd = (os.open(self.source_dir, os.O_RDONLY | os.O_DIRECTORY)
+                      if _HAVE_DIR_FD else None)
+            try:
+                self._move_files(buckets, total_files, dir_fd)
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
             
-            # Process each file
-            for index, file in enumerate(files):
-                # Skip hidden files
-                if file.startswith('.'):
-                    continue
-                
-                # Get file extension
-                _, ext = os.path.splitext(file)
-                ext = ext.lower()[1:]  # Remove the dot and convert to lowercase
-                
-                if not ext:
-                    ext = 'no_extension'
-                
-                # Update counter
-                organized_files[ext] = organized_files.get(ext, 0) + 1
-                
-                # Only move files if not in preview mode
-                if not self.preview_only:
-                    # Create directory for the extension if it doesn't exist
-                    ext_dir = os.path.join(self.source_dir, ext)
-                    if not os.path.exists(ext_dir):
-                        os.makedirs(ext_dir)
-                    
-                    # Move file to the appropriate directory
-                    source_path = os.path.join(self.source_dir, file)
-                    dest_path = os.path.join(ext_dir, file)
-                    
-                    # Handle file name conflicts
-                    if os.path.exists(dest_path):
-                        base, extension = os.path.splitext(file)
-                        counter = 1
-                        while os.path.exists(os.path.join(ext_dir, f"{base}_{counter}{extension}")):
-                            counter += 1
-                        dest_path = os.path.join(ext_dir, f"{base}_{counter}{extension}")
-                    
-                    shutil.move(source_path, dest_path)
-                
-                # Update progress
-                progress = int((index + 1) / total_files * 100)
-                self.progress_update.emit(progress)
-            
-            # Emit appropriate signal based on mode
-            if self.preview_only:
-                self.preview_signal.emit(organized_files)
-            else:
-                self.finished_signal.emit(organized_files)
+            self.finished_signal.emit(organized_files)
             
         except Exception as e:
-            self.error_signal.emit(f"Error {'previewing' if self.preview_only else 'organizing'} files: {str(e)}")
+            self.error_signal.emit(f"Error organizing files: {str(e)}")
 
 
 class FileOrganizerApp(QMainWindow):
@@ -155,6 +356,7 @@ class FileOrganizerApp(QMainWindow):
         # Initialize variables
         self.selected_dir = None
         self.organizer_thread = None
+        self.moved_files = {}
     
     def select_directory(self):
         dir_path = QFileDialog.getExistingDirectory(self, "Select Directory to Organize")
@@ -206,10 +408,12 @@ class FileOrganizerApp(QMainWindow):
             self.progress_bar.setVisible(True)
             self.results_list.clear()
             self.status_label.setText("Organizing files...")
+            self.moved_files = {}
             
             # Create and start the organizer thread
             self.organizer_thread = FileOrganizerThread(self.selected_dir, preview_only=False)
             self.organizer_thread.progress_update.connect(self.update_progress)
+            self.organizer_thread.chunk_signal.connect(self.update_moved_files)
             self.organizer_thread.finished_signal.connect(self.organization_finished)
             self.organizer_thread.error_signal.connect(self.show_error)
             self.organizer_thread.start()
@@ -217,6 +421,13 @@ class FileOrganizerApp(QMainWindow):
     def update_progress(self, value):
         self.progress_bar.setValue(value)
     
+    def update_moved_files(self, files_done, batch_counts):
+        """Merge a chunk of moved file counts into the running totals"""
+        for ext, count in batch_counts.items():
+            self.moved_files[ext] = self.moved_files.get(ext, 0) + count
+        self.status_label.setText(
+            f"Organizing files... {files_done} moved into {len(self.moved_files)} folders")
+    
     def preview_finished(self, organized_files):
         # Re-enable buttons
         self.toggle_ui_elements(True)
@@ -224,11 +435,14 @@ class FileOrganizerApp(QMainWindow):
         # Update results list
         self.results_list.clear()
         total_files = sum(organized_files.values())
-        self.results_list.addItem(f"PREVIEW: Total files that would be organized: {total_files}")
+        items = [f"PREVIEW: Total files that would be organized: {total_files}"]
         
-        for ext, count in sorted(organized_files.items()):
+        for ext, count in sorted(organized_files.items(), key=itemgetter(0)):
             folder_name = ext if ext else "no_extension"
-            self.results_list.addItem(f"{folder_name}: {count} files would be moved")
+            items.append(f"{folder_name}: {count} files would be moved")
+        
+        # Add all rows at once so the list is only updated one time
+        self.results_list.addItems(items)
         
         # Update status
         self.status_label.setText("Preview completed! Use Organize Files to perform the actual organization.")
@@ -240,11 +454,14 @@ class FileOrganizerApp(QMainWindow):
         # Update results list
         self.results_list.clear()
         total_files = sum(organized_files.values())
-        self.results_list.addItem(f"Total files organized: {total_files}")
+        items = [f"Total files organized: {total_files}"]
         
-        for ext, count in sorted(organized_files.items()):
+        for ext, count in sorted(organized_files.items(), key=itemgetter(0)):
             folder_name = ext if ext else "no_extension"
-            self.results_list.addItem(f"{folder_name}: {count} files")
+            items.append(f"{folder_name}: {count} files")
+        
+        # Add all rows at once so the list is only updated one time
+        self.results_list.addItems(items)
         
         # Update status
         self.status_label.setText("Organization completed!")